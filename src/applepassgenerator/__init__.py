@@ -1,2 +1,16 @@
 __version__ = "0.0.2"
 __author__ = "Primedigital Global"
+
+try:
+    # Third Party Stuff
+    from zlib_ng import zlib_ng
+except ImportError:
+    pass
+else:
+    # Standard Library
+    import zipfile
+
+    # zipfile computes the CRC32 of every entry through its module level
+    # crc32, zlib-ng's implementation gives the same checksums using the
+    # CPU's carry-less multiply instructions (installed with the "zlib-ng" extra)
+    zipfile.crc32 = zlib_ng.crc32
@@ -1,15 +1,27 @@
 # Standard Library
 import decimal
+import enum
+import functools
 import hashlib
 import json
+import os
+import uuid
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from io import BytesIO
+from pathlib import Path
 
 # Third Party Stuff
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.serialization import pkcs7
 
+try:
+    # Third Party Stuff
+    import orjson
+except ImportError:  # installed with the "orjson" extra
+    orjson = None
+
 
 class Alignment:
     LEFT = "PKTextAlignmentLeft"
@@ -26,6 +38,12 @@ class BarcodeFormat:
     CODE128 = "PKBarcodeFormatCode128"
 
 
+# Formats supported by the legacy 'barcode' key
+_ORIGINAL_BARCODE_FORMATS = frozenset(
+    {BarcodeFormat.PDF417, BarcodeFormat.QR, BarcodeFormat.AZTEC}
+)
+
+
 class TransitType:
     AIR = "PKTransitTypeAir"
     TRAIN = "PKTransitTypeTrain"
@@ -49,6 +67,15 @@ class NumberStyle:
     SPELLOUT = "PKNumberStyleSpellOut"
 
 
+# Field keys that are left out of pass.json while they hold the value
+# Wallet assumes when the key is missing
+_FIELD_DEFAULTS = (
+    ("changeMessage", ""),
+    ("textAlignment", Alignment.NATURAL),
+    ("isRelative", False),
+)
+
+
 class Field(object):
     def __init__(self, key, value, label=""):
         self.key = key  # Required. The key must be unique within the scope
@@ -58,7 +85,11 @@ class Field(object):
         self.textAlignment = Alignment.LEFT
 
     def json_dict(self):
-        return self.__dict__
+        d = dict(self.__dict__)
+        for key, default in _FIELD_DEFAULTS:
+            if key in d and d[key] == default:
+                del d[key]
+        return d
 
 
 class DateField(Field):
@@ -80,27 +111,18 @@ class DateField(Field):
         if ignores_time_zone:
             self.ignoresTimeZone = ignores_time_zone
 
-    def json_dict(self):
-        return self.__dict__
-
 
 class NumberField(Field):
     def __init__(self, key, value, label=""):
         super(NumberField, self).__init__(key, value, label)
         self.numberStyle = NumberStyle.DECIMAL  # Style of date to display
 
-    def json_dict(self):
-        return self.__dict__
-
 
 class CurrencyField(NumberField):
     def __init__(self, key, value, label="", currency_code=""):
         super(CurrencyField, self).__init__(key, value, label)
         self.currencyCode = currency_code  # ISO 4217 currency code
 
-    def json_dict(self):
-        return self.__dict__
-
 
 class Barcode(object):
     def __init__(
@@ -164,6 +186,24 @@ class IBeacon(object):
 
 
 class PassInformation(object):
+    # (pass.json key, attribute) for each field section
+    _FIELD_MAP = (
+        ("headerFields", "header_fields"),
+        ("primaryFields", "primary_fields"),
+        ("secondaryFields", "secondary_fields"),
+        ("backFields", "back_fields"),
+        ("auxiliaryFields", "auxiliary_fields"),
+    )
+
+    __slots__ = (
+        "header_fields",
+        "primary_fields",
+        "secondary_fields",
+        "back_fields",
+        "auxiliary_fields",
+        "jsonname",
+    )
+
     def __init__(self):
         self.header_fields = []
         self.primary_fields = []
@@ -188,24 +228,16 @@ class PassInformation(object):
 
     def json_dict(self):
         d = {}
-        if self.header_fields:
-            d.update({"headerFields": [f.json_dict() for f in self.header_fields]})
-        if self.primary_fields:
-            d.update({"primaryFields": [f.json_dict() for f in self.primary_fields]})
-        if self.secondary_fields:
-            d.update(
-                {"secondaryFields": [f.json_dict() for f in self.secondary_fields]}
-            )
-        if self.back_fields:
-            d.update({"backFields": [f.json_dict() for f in self.back_fields]})
-        if self.auxiliary_fields:
-            d.update(
-                {"auxiliaryFields": [f.json_dict() for f in self.auxiliary_fields]}
-            )
+        for key, attribute in self._FIELD_MAP:
+            fields = getattr(self, attribute)
+            if fields:
+                d[key] = [f.json_dict() for f in fields]
         return d
 
 
 class BoardingPass(PassInformation):
+    __slots__ = ("transit_type",)
+
     def __init__(self, transit_type=TransitType.AIR):
         super(BoardingPass, self).__init__()
         self.transit_type = transit_type
@@ -218,30 +250,109 @@ class BoardingPass(PassInformation):
 
 
 class Coupon(PassInformation):
+    __slots__ = ()
+
     def __init__(self):
         super(Coupon, self).__init__()
         self.jsonname = "coupon"
 
 
 class EventTicket(PassInformation):
+    __slots__ = ()
+
     def __init__(self):
         super(EventTicket, self).__init__()
         self.jsonname = "eventTicket"
 
 
 class Generic(PassInformation):
+    __slots__ = ()
+
     def __init__(self):
         super(Generic, self).__init__()
         self.jsonname = "generic"
 
 
 class StoreCard(PassInformation):
+    __slots__ = ()
+
     def __init__(self):
         super(StoreCard, self).__init__()
         self.jsonname = "storeCard"
 
 
+# pass.json keys emitted by ApplePass.json_dict only when the matching
+# attribute is set
+_OPTIONAL_KEYS = (
+    ("relevantDate", "relevant_date"),
+    ("backgroundColor", "background_color"),
+    ("foregroundColor", "foreground_color"),
+    ("labelColor", "label_color"),
+    ("logoText", "logo_text"),
+    ("userInfo", "user_info"),
+    ("associatedStoreIdentifiers", "associated_store_identifiers"),
+    ("appLaunchURL", "app_launch_url"),
+    ("expirationDate", "expiration_date"),
+)
+# Optional keys holding Location / IBeacon objects, json_dict converts them
+# itself so that the JSON encoder only gets plain dicts and lists
+_OPTIONAL_OBJECT_KEYS = (
+    ("locations", "locations"),
+    ("beacons", "ibeacons"),
+)
+
+
+# cryptography 40+ refuses to create SHA-1 PKCS7 signatures, Wallet accepts
+# SHA-256 ones
+_SIGNATURE_HASH_ALGORITHM = hashes.SHA256()
+_SIGNATURE_OPTIONS = (pkcs7.PKCS7Options.DetachedSignature,)
+
+# Below this many files to hash, starting the threads costs more than
+# hashing the files one after the other
+_PARALLEL_HASH_MIN_FILES = 4
+
+# Already compressed formats, which deflate would not shrink
+_COMPRESSED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+# Fastest deflate level, the entries it applies to are small
+_DEFLATE_LEVEL = 1
+
+# Earliest timestamp the zip format can store
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
 class ApplePass(object):
+    # Fixed attribute layout instead of a per-instance __dict__, one entry
+    # per attribute set in __init__
+    __slots__ = (
+        "_files",
+        "_hashes",
+        "team_identifier",
+        "pass_type_identifier",
+        "organization_name",
+        "serial_number",
+        "description",
+        "format_version",
+        "background_color",
+        "foreground_color",
+        "label_color",
+        "logo_text",
+        "barcode",
+        "barcodes",
+        "emit_legacy_barcode",
+        "suppress_strip_shine",
+        "web_service_url",
+        "authentication_token",
+        "locations",
+        "ibeacons",
+        "relevant_date",
+        "associated_store_identifiers",
+        "app_launch_url",
+        "user_info",
+        "expiration_date",
+        "voided",
+        "pass_information",
+    )
+
     def __init__(
         self,
         pass_information,
@@ -279,6 +390,9 @@ class ApplePass(object):
         self.logo_text = None  # Optional. Text displayed next to the logo
         self.barcode = None  # Optional. Information specific to barcodes. This is deprecated and can only be set to original barcode formats.
         self.barcodes = None  # Optional.  All supported barcodes
+        # Optional. If false, only 'barcodes' is written, which is enough
+        # for iOS 9 and later
+        self.emit_legacy_barcode = True
         # Optional. If true, the strip image is displayed
         self.suppress_strip_shine = False
 
@@ -311,11 +425,15 @@ class ApplePass(object):
 
         self.pass_information = pass_information
 
-    # Adds file to the file array
+    # Adds file to the file array, fd is either a binary file object or bytes
     def add_file(self, name, fd):
-        self._files[name] = fd.read()
+        self._files[name] = _to_bytes(name, fd)
+        # Drops the digest of a file this one replaces
+        self._hashes.pop(name, None)
 
-    # Creates the actual .pkpass file
+    # Creates the actual .pkpass file and returns zip_file. zip_file is a path
+    # or any writable file object, which may be unseekable like an HTTP
+    # response stream, and defaults to a new BytesIO
     def create(self, certificate, key, wwdr_certificate, password, zip_file=None):
         pass_json = self._create_pass_json()
         manifest = self._create_manifest(pass_json)
@@ -328,26 +446,38 @@ class ApplePass(object):
         self._create_zip(pass_json, manifest, signature, zip_file=zip_file)
         return zip_file
 
+    # Creates the .pkpass in memory and returns its content as bytes
+    def create_bytes(self, certificate, key, wwdr_certificate, password):
+        zip_file = self.create(
+            certificate, key, wwdr_certificate, password, zip_file=BytesIO()
+        )
+        return zip_file.getvalue()
+
     def _create_pass_json(self):
-        return json.dumps(self, default=pass_handler)
+        return _json_dumps(self.json_dict())
 
     def _create_manifest(self, pass_json):
         """
         Creates the hashes for all the files included in the pass file.
+        Both pass_json and the returned manifest are UTF-8 encoded bytes.
+        Attachments only change through add_file, so their digests are kept
+        between calls and only new files are hashed.
         """
-        self._hashes["pass.json"] = hashlib.sha1(pass_json.encode("utf-8")).hexdigest()
-        for filename, filedata in self._files.items():
-            self._hashes[filename] = hashlib.sha1(filedata).hexdigest()
-        return json.dumps(self._hashes)
-
-    def _read_file_bytes(self, path):
-        """
-        Utility function to read files as byte data
-        :param path: file path
-        :returns bytes
-        """
-        file = open(path)
-        return file.read().encode("UTF-8")
+        self._hashes["pass.json"] = _sha1_hexdigest(pass_json)
+        pending = [name for name in self._files if name not in self._hashes]
+        if len(pending) >= _PARALLEL_HASH_MIN_FILES:
+            # hashlib releases the GIL while hashing, so the files are
+            # hashed in parallel
+            max_workers = min(len(pending), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                digests = executor.map(
+                    _sha1_hexdigest, [self._files[name] for name in pending]
+                )
+                self._hashes.update(zip(pending, digests))
+        else:
+            for filename in pending:
+                self._hashes[filename] = _sha1_hexdigest(self._files[filename])
+        return _json_dumps(self._hashes)
 
     def _create_signature_crypto(
         self, manifest, certificate, key, wwdr_certificate, password
@@ -358,34 +488,37 @@ class ApplePass(object):
         The manifest is the file
         containing a list of files included in the pass file (and their hashes).
         """
-        cert = x509.load_pem_x509_certificate(self._read_file_bytes(certificate))
-        if password is not None:
-            password = password.encode("UTF-8")
-        priv_key = serialization.load_pem_private_key(
-            self._read_file_bytes(key), password=password
-        )
-        wwdr_cert = x509.load_pem_x509_certificate(
-            self._read_file_bytes(wwdr_certificate)
-        )
-
-        options = [pkcs7.PKCS7Options.DetachedSignature]
-        return (
-            pkcs7.PKCS7SignatureBuilder()
-            .set_data(manifest.encode("UTF-8"))
-            .add_signer(cert, priv_key, hashes.SHA1())
-            .add_certificate(wwdr_cert)
-            .sign(serialization.Encoding.DER, options)
+        signing_material = load_signing_material(
+            certificate, key, wwdr_certificate, password
         )
+        return sign_manifest(manifest, signing_material)
 
     # Creates .pkpass (zip archive)
     def _create_zip(self, pass_json, manifest, signature, zip_file=None):
-        zf = zipfile.ZipFile(zip_file or "pass.pkpass", "w")
-        zf.writestr("signature", signature)
-        zf.writestr("manifest.json", manifest)
-        zf.writestr("pass.json", pass_json)
-        for filename, filedata in self._files.items():
-            zf.writestr(filename, filedata)
-        zf.close()
+        zip_file = zip_file or "pass.pkpass"
+        if isinstance(zip_file, (str, os.PathLike)):
+            # ZipFile seeks back after each entry to fill in its local header,
+            # which flushes any write buffer. The archive is built in memory
+            # and written to the file with a single write() call instead.
+            buffer = BytesIO()
+            self._write_zip(pass_json, manifest, signature, buffer)
+            with open(zip_file, "wb") as fd:
+                fd.write(buffer.getbuffer())
+        else:
+            self._write_zip(pass_json, manifest, signature, zip_file)
+
+    def _write_zip(self, pass_json, manifest, signature, zip_file):
+        # No compression argument, _zip_info picks STORED or DEFLATED for
+        # each entry
+        with zipfile.ZipFile(zip_file, "w", allowZip64=False) as zf:
+            entries = [
+                ("signature", signature),
+                ("manifest.json", manifest),
+                ("pass.json", pass_json),
+            ]
+            entries.extend(self._files.items())
+            for filename, filedata in entries:
+                zf.writestr(_zip_info(filename), filedata, compresslevel=_DEFLATE_LEVEL)
 
     def json_dict(self):
         d = {
@@ -400,60 +533,281 @@ class ApplePass(object):
         }
         # barcodes have 2 fields, 'barcode' is legacy so limit it to the legacy formats, 'barcodes' supports all
         if self.barcode:
-            original_formats = [
-                BarcodeFormat.PDF417,
-                BarcodeFormat.QR,
-                BarcodeFormat.AZTEC,
-            ]
-            legacy_barcode = self.barcode
-            new_barcodes = [self.barcode.json_dict()]
-            if self.barcode.format not in original_formats:
-                legacy_barcode = Barcode(
-                    self.barcode.message, BarcodeFormat.PDF417, self.barcode.altText
-                )
-            d.update({"barcodes": new_barcodes})
-            d.update({"barcode": legacy_barcode})
-
-        if self.relevant_date:
-            d.update({"relevantDate": self.relevant_date})
-        if self.background_color:
-            d.update({"backgroundColor": self.background_color})
-        if self.foreground_color:
-            d.update({"foregroundColor": self.foreground_color})
-        if self.label_color:
-            d.update({"labelColor": self.label_color})
-        if self.logo_text:
-            d.update({"logoText": self.logo_text})
-        if self.locations:
-            d.update({"locations": self.locations})
-        if self.ibeacons:
-            d.update({"beacons": self.ibeacons})
-        if self.user_info:
-            d.update({"userInfo": self.user_info})
-        if self.associated_store_identifiers:
-            d.update({"associatedStoreIdentifiers": self.associated_store_identifiers})
-        if self.app_launch_url:
-            d.update({"appLaunchURL": self.app_launch_url})
-        if self.expiration_date:
-            d.update({"expirationDate": self.expiration_date})
+            barcode = self.barcode.json_dict()
+            d["barcodes"] = [barcode]
+            if self.emit_legacy_barcode:
+                if self.barcode.format in _ORIGINAL_BARCODE_FORMATS:
+                    d["barcode"] = barcode
+                else:
+                    d["barcode"] = dict(barcode, format=BarcodeFormat.PDF417)
+
+        for key, attribute in _OPTIONAL_KEYS:
+            value = getattr(self, attribute)
+            if value:
+                d[key] = value
+        for key, attribute in _OPTIONAL_OBJECT_KEYS:
+            value = getattr(self, attribute)
+            if value:
+                d[key] = _json_value(value)
         if self.voided:
-            d.update({"voided": True})
+            d["voided"] = True
         if self.web_service_url:
-            d.update(
-                {
-                    "webServiceURL": self.web_service_url,
-                    "authenticationToken": self.authentication_token,
-                }
-            )
+            d["webServiceURL"] = self.web_service_url
+            d["authenticationToken"] = self.authentication_token
         return d
 
 
-def pass_handler(obj):
-    if hasattr(obj, "json_dict"):
-        return obj.json_dict()
+def _json_dumps(obj):
+    """
+    Serializes obj to compact UTF-8 encoded JSON, with orjson when it is
+    installed. Non-str keys are turned to strings, UUIDs, enums, datetimes
+    and dataclasses go through pass_handler, and what orjson can't encode
+    (integers above 64 bits, lone surrogates) is left to json. NaN and
+    infinity are not valid JSON: json rejects them, orjson writes null.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=pass_handler,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            pass
+    try:
+        return json.dumps(
+            obj,
+            default=pass_handler,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates can't be encoded to UTF-8, they are kept as \u
+        # escapes instead
+        return json.dumps(
+            obj, default=pass_handler, allow_nan=False, separators=(",", ":")
+        ).encode("ascii")
+
+
+def _json_value(value):
+    """
+    Replaces objects that have a json_dict, alone or in a list, by their dict
+    """
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    if hasattr(value, "json_dict"):
+        return value.json_dict()
+    return value
+
+
+_ATTACHMENT_TYPE_ERROR = (
+    "%s must be bytes or a file object opened in binary mode, .pkpass files "
+    "only hold bytes"
+)
+
+
+def _to_bytes(name, fd):
+    """
+    Normalizes an attachment to bytes when it is added, so that the manifest
+    and the zip writer only ever deal with bytes
+    :param name: file name inside the .pkpass, used in error messages
+    :param fd: bytes (stored without a copy, so preferred), BytesIO or a file
+        opened in binary mode, not a str or a path
+    :raises TypeError: for any other object
+    :returns bytes
+    """
+    if isinstance(fd, (bytes, bytearray, memoryview)):
+        return bytes(fd)
+    if isinstance(fd, BytesIO):
+        # Shares the BytesIO buffer instead of copying it like read() does,
+        # and takes the whole content whatever the current position is
+        return fd.getvalue()
+    # A str or path is not taken as a file name, it is rejected like any
+    # other object that can't be read
+    if isinstance(fd, (str, os.PathLike)) or getattr(fd, "read", None) is None:
+        raise TypeError(_ATTACHMENT_TYPE_ERROR % name)
+    data = fd.read()
+    if isinstance(data, str):
+        raise TypeError(_ATTACHMENT_TYPE_ERROR % name)
+    return data
+
+
+def _read_file_bytes(path):
+    """
+    Utility function to read files as byte data
+    :param path: file path
+    :returns bytes
+    """
+    return Path(path).read_bytes()
+
+
+def _file_cache_key(path):
+    """
+    Identifies a file by its absolute path and modification time, so that
+    cached content is reloaded once the file is replaced
+    """
+    path = os.path.abspath(path)
+    # Nanoseconds, a float of seconds can miss a file replaced right after
+    # it was first loaded
+    return path, os.stat(path).st_mtime_ns
+
+
+# A handful of credential sets is plenty, this also bounds how many
+# replaced keys stay in memory
+@functools.lru_cache(maxsize=8)
+def _load_signing_material(certificate, key, wwdr_certificate, password):
+    """
+    Loads the signer certificate, its private key and the WWDR certificate.
+    Files are given as _file_cache_key() tuples and the parsed objects are
+    cached, so repeated create() calls with the same credentials skip the
+    PEM parsing and private key loading.
+    :returns (certificate, private key, WWDR certificate)
+    """
+    cert = x509.load_pem_x509_certificate(_read_file_bytes(certificate[0]))
+    # password may also be given as bytes, in the encoding the key was
+    # created with
+    if isinstance(password, str):
+        password = password.encode("UTF-8")
+    priv_key = serialization.load_pem_private_key(
+        _read_file_bytes(key[0]), password=password
+    )
+    wwdr_cert = x509.load_pem_x509_certificate(_read_file_bytes(wwdr_certificate[0]))
+    return cert, priv_key, wwdr_cert
+
+
+def create_many(
+    passes, certificate, key, wwdr_certificate, password=None, max_workers=None
+):
+    """
+    Creates several passes signed with the same credentials. pass.json and
+    the manifests are built in this process and the RSA signatures, which
+    dominate the cost, are spread over a process pool. Each worker loads the
+    signing material once and keeps it cached.
+    With the spawn start method (the default on macOS and Windows) workers
+    import the main module again, so scripts must call this under
+    `if __name__ == "__main__":`. max_workers=1 signs in this process.
+    :param passes: iterable of ApplePass
+    :param max_workers: number of worker processes, defaults to the CPU count,
+        1 signs in this process without a pool
+    :returns list of BytesIO holding the .pkpass files, in the order of passes
+    """
+    # Iterated several times below, a generator would be empty after the first
+    passes = list(passes)
+    pass_jsons = [apple_pass._create_pass_json() for apple_pass in passes]
+    manifests = [
+        apple_pass._create_manifest(pass_json)
+        for apple_pass, pass_json in zip(passes, pass_jsons)
+    ]
+    sign = functools.partial(
+        _sign_with_files, (certificate, key, wwdr_certificate, password)
+    )
+    if len(manifests) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            signatures = list(executor.map(sign, manifests))
     else:
-        # For Decimal latitude and longitude etc
-        if isinstance(obj, decimal.Decimal):
-            return str(obj)
-        else:
-            return obj
+        signatures = [sign(manifest) for manifest in manifests]
+
+    zip_files = []
+    for apple_pass, pass_json, manifest, signature in zip(
+        passes, pass_jsons, manifests, signatures
+    ):
+        zip_file = BytesIO()
+        apple_pass._create_zip(pass_json, manifest, signature, zip_file=zip_file)
+        zip_files.append(zip_file)
+    return zip_files
+
+
+def _sign_with_files(credentials, manifest):
+    """
+    Signs a manifest given the credential file paths and password, so that
+    only picklable arguments cross to create_many's worker processes
+    """
+    return sign_manifest(manifest, load_signing_material(*credentials))
+
+
+def load_signing_material(certificate, key, wwdr_certificate, password):
+    """
+    Loads the signing material for sign_manifest. Results are cached per
+    process until one of the files changes.
+    :param certificate: path of the pass certificate (PEM)
+    :param key: path of its private key (PEM)
+    :param wwdr_certificate: path of the WWDR certificate (PEM)
+    :param password: private key password, str, bytes or None
+    :returns (certificate, private key, WWDR certificate)
+    """
+    return _load_signing_material(
+        _file_cache_key(certificate),
+        _file_cache_key(key),
+        _file_cache_key(wwdr_certificate),
+        password,
+    )
+
+
+def sign_manifest(manifest, signing_material):
+    """
+    Creates the detached PKCS7 signature (DER encoded) of the manifest bytes.
+    PKCS7SignatureBuilder is immutable so it is built per manifest, only the
+    loaded signing material and the signer options are shared.
+    :param manifest: manifest.json content as bytes
+    :param signing_material: tuple returned by load_signing_material
+    :returns bytes
+    """
+    cert, priv_key, wwdr_cert = signing_material
+    return (
+        pkcs7.PKCS7SignatureBuilder()
+        .set_data(manifest)
+        .add_signer(cert, priv_key, _SIGNATURE_HASH_ALGORITHM)
+        .add_certificate(wwdr_cert)
+        .sign(serialization.Encoding.DER, _SIGNATURE_OPTIONS)
+    )
+
+
+def _sha1_hexdigest(data):
+    # SHA-1 is only used as a content digest here, the manifest itself is
+    # protected by the signature. The pass format defines manifest.json as
+    # SHA-1 digests, so unlike the signature this is not switched to SHA-256.
+    return hashlib.sha1(data, usedforsecurity=False).hexdigest()
+
+
+def _zip_info(filename):
+    """
+    Zip entry with a fixed timestamp so that the archive layout does not
+    depend on when the pass was created. Images are stored as they are,
+    everything else (JSON, .strings, signature) is deflated.
+    """
+    zinfo = zipfile.ZipInfo(filename, date_time=_ZIP_DATE_TIME)
+    if not filename.lower().endswith(_COMPRESSED_EXTENSIONS):
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    # Same permissions ZipFile.writestr gives entries added by name
+    zinfo.external_attr = 0o600 << 16
+    return zinfo
+
+
+# Converters for the exact types aside from json_dict objects that pass
+# data may hold, looked up before anything else
+_TYPE_HANDLERS = {
+    # For Decimal latitude and longitude etc
+    decimal.Decimal: str,
+    # Written as orjson does natively
+    uuid.UUID: str,
+}
+
+
+def pass_handler(obj):
+    handler = _TYPE_HANDLERS.get(type(obj))
+    if handler is not None:
+        return handler(obj)
+    # Looked up on the class, instances never override it
+    json_dict = getattr(type(obj), "json_dict", None)
+    if json_dict is not None:
+        return json_dict(obj)
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    # json and orjson expect unsupported types to raise instead of being
+    # returned as is
+    raise TypeError("Object of type %s is not JSON serializable" % type(obj).__name__)
@@ -0,0 +1,55 @@
+# Standard Library
+import datetime
+
+# Third Party Stuff
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+CERTIFICATE_PASSWORD = "secret"
+
+
+def _make_certificate(common_name, key, issuer=None, issuer_key=None):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    return (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer or subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(issuer_key or key, hashes.SHA256())
+    )
+
+
+@pytest.fixture(scope="session")
+def signing_files(tmp_path_factory):
+    """
+    Self-signed stand-ins for the pass certificate, its private key and the
+    WWDR certificate, written as PEM files.
+    """
+    directory = tmp_path_factory.mktemp("certificates")
+    wwdr_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    wwdr_cert = _make_certificate("WWDR", wwdr_key)
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    cert = _make_certificate(
+        "pass.com.project.example", key, wwdr_cert.subject, wwdr_key
+    )
+
+    certificate_path = directory / "certificate.pem"
+    certificate_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path = directory / "private.key"
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.BestAvailableEncryption(CERTIFICATE_PASSWORD.encode()),
+        )
+    )
+    wwdr_path = directory / "wwdr.pem"
+    wwdr_path.write_bytes(wwdr_cert.public_bytes(serialization.Encoding.PEM))
+    return str(certificate_path), str(key_path), str(wwdr_path), CERTIFICATE_PASSWORD
@@ -0,0 +1,36 @@
+# Standard Library
+import importlib
+import sys
+import types
+import zipfile
+import zlib
+from io import BytesIO
+
+import applepassgenerator
+
+
+def test_zlib_ng_crc32(monkeypatch):
+    calls = []
+
+    def crc32(data, value=0):
+        calls.append(len(data))
+        return zlib.crc32(data, value)
+
+    zlib_ng = types.ModuleType("zlib_ng.zlib_ng")
+    zlib_ng.crc32 = crc32
+    package = types.ModuleType("zlib_ng")
+    package.zlib_ng = zlib_ng
+    monkeypatch.setitem(sys.modules, "zlib_ng", package)
+    monkeypatch.setitem(sys.modules, "zlib_ng.zlib_ng", zlib_ng)
+    # Undone after the test, importing the package replaces it
+    monkeypatch.setattr(zipfile, "crc32", zipfile.crc32)
+
+    importlib.reload(applepassgenerator)
+
+    assert zipfile.crc32 is crc32
+    zip_file = BytesIO()
+    with zipfile.ZipFile(zip_file, "w") as zf:
+        zf.writestr("pass.json", b"{}")
+    with zipfile.ZipFile(zip_file) as zf:
+        assert zf.testzip() is None
+    assert calls
@@ -0,0 +1,443 @@
+# Standard Library
+import dataclasses
+import datetime
+import decimal
+import enum
+import hashlib
+import json
+import os
+import uuid
+import zipfile
+from io import BytesIO, RawIOBase, StringIO
+from pathlib import Path
+
+# Third Party Stuff
+import pytest
+from cryptography.hazmat.primitives.serialization import pkcs7
+
+from applepassgenerator import models
+from applepassgenerator.models import (
+    Alignment,
+    ApplePass,
+    Barcode,
+    BarcodeFormat,
+    DateField,
+    EventTicket,
+    Field,
+    Location,
+)
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclasses.dataclass
+class Point:
+    x: int = 1
+
+
+@pytest.fixture
+def apple_pass():
+    card_info = EventTicket()
+    card_info.add_primary_field("name", "Tony Stark", "Name")
+    card_info.add_secondary_field("loc", "USA", "Country")
+    apple_pass = ApplePass(
+        card_info,
+        pass_type_identifier="pass.com.project.example",
+        organization_name="Primedigital Global",
+        team_identifier="1234ABCDEF",
+    )
+    apple_pass.serial_number = "1234"
+    apple_pass.description = "Event ticket"
+    apple_pass.add_file("icon.png", BytesIO(b"icon"))
+    return apple_pass
+
+
+def test_field_json_dict_skips_defaults():
+    field = Field("name", "Tony Stark", "Name")
+    assert field.json_dict() == {
+        "key": "name",
+        "value": "Tony Stark",
+        "label": "Name",
+        "textAlignment": Alignment.LEFT,
+    }
+
+    field.changeMessage = "Name changed to %@"
+    field.textAlignment = Alignment.NATURAL
+    assert field.json_dict() == {
+        "key": "name",
+        "value": "Tony Stark",
+        "label": "Name",
+        "changeMessage": "Name changed to %@",
+    }
+
+
+def test_date_field_json_dict_skips_defaults():
+    field = DateField("date", "2023-01-04T10:00Z")
+    assert "isRelative" not in field.json_dict()
+
+    field.isRelative = True
+    assert field.json_dict()["isRelative"] is True
+
+
+def test_json_dict_converts_locations(apple_pass):
+    apple_pass.locations = [Location(25.2, 55.3)]
+
+    assert apple_pass.json_dict()["locations"] == [
+        {
+            "latitude": 25.2,
+            "longitude": 55.3,
+            "altitude": 0.0,
+            "distance": None,
+            "relevantText": "",
+        }
+    ]
+
+
+def test_pass_json(apple_pass):
+    apple_pass.locations = [Location(25.2, 55.3)]
+    apple_pass.user_info = {"price": decimal.Decimal("9.99")}
+
+    pass_json = json.loads(apple_pass._create_pass_json())
+
+    assert pass_json["serialNumber"] == "1234"
+    assert pass_json["eventTicket"]["primaryFields"][0]["value"] == "Tony Stark"
+    assert pass_json["locations"][0]["latitude"] == 25.2
+    assert pass_json["userInfo"] == {"price": "9.99"}
+
+
+def test_pass_handler():
+    class Price(decimal.Decimal):
+        pass
+
+    assert models.pass_handler(decimal.Decimal("9.99")) == "9.99"
+    assert models.pass_handler(Price("9.99")) == "9.99"
+    assert models.pass_handler(Location(1, 2))["latitude"] == 1.0
+    with pytest.raises(TypeError):
+        models.pass_handler(object())
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_pass_json_is_utf8_bytes(apple_pass, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(models, "orjson", None)
+    apple_pass.description = "Café"
+
+    pass_json = apple_pass._create_pass_json()
+
+    assert isinstance(pass_json, bytes)
+    assert "Café".encode("utf-8") in pass_json
+
+
+def test_pass_json_without_orjson(apple_pass, monkeypatch):
+    apple_pass.user_info = {
+        1: "a",
+        "id": uuid.UUID(int=1),
+        "color": Color.RED,
+    }
+    if models.orjson is not None:
+        # Fails the test if orjson falls back to json for these values
+        with monkeypatch.context() as m:
+            m.setattr(models, "json", None)
+            pass_json = apple_pass._create_pass_json()
+    else:
+        pass_json = apple_pass._create_pass_json()
+    monkeypatch.setattr(models, "orjson", None)
+
+    assert apple_pass._create_pass_json() == pass_json
+    assert json.loads(pass_json)["userInfo"] == {
+        "1": "a",
+        "id": "00000000-0000-0000-0000-000000000001",
+        "color": "red",
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_pass_json_big_int(apple_pass, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(models, "orjson", None)
+    apple_pass.user_info = {"count": 2**70}
+
+    assert json.loads(apple_pass._create_pass_json())["userInfo"] == {"count": 2**70}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_pass_json_escapes_lone_surrogates(apple_pass, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(models, "orjson", None)
+    apple_pass.description = "bad \ud800"
+
+    pass_json = apple_pass._create_pass_json()
+
+    assert b'"bad \\ud800"' in pass_json
+    assert json.loads(pass_json)["description"] == "bad \ud800"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize(
+    "value",
+    [datetime.datetime(2024, 1, 1), Point()],
+    ids=["datetime", "dataclass"],
+)
+def test_pass_json_rejects_unsupported_types(
+    apple_pass, monkeypatch, use_orjson, value
+):
+    if not use_orjson:
+        monkeypatch.setattr(models, "orjson", None)
+    apple_pass.user_info = {"value": value}
+
+    with pytest.raises(TypeError):
+        apple_pass._create_pass_json()
+
+
+def test_pass_json_rejects_nan_without_orjson(apple_pass, monkeypatch):
+    monkeypatch.setattr(models, "orjson", None)
+    apple_pass.user_info = {"ratio": float("nan")}
+
+    with pytest.raises(ValueError):
+        apple_pass._create_pass_json()
+
+
+def test_add_file_accepts_bytes(apple_pass):
+    apple_pass.add_file("logo.png", b"logo")
+    apple_pass.add_file("strip.png", bytearray(b"strip"))
+
+    assert apple_pass._files["logo.png"] == b"logo"
+    assert apple_pass._files["strip.png"] == b"strip"
+
+
+def test_add_file_takes_whole_bytesio(apple_pass):
+    fd = BytesIO()
+    fd.write(b"logo")
+    apple_pass.add_file("logo.png", fd)
+
+    assert apple_pass._files["logo.png"] == b"logo"
+
+
+@pytest.mark.parametrize("fd", [StringIO("logo"), "logo", Path("logo.png"), None, 42])
+def test_add_file_rejects_text(apple_pass, fd):
+    with pytest.raises(TypeError, match="binary mode"):
+        apple_pass.add_file("logo.png", fd)
+
+
+def test_legacy_barcode(apple_pass):
+    apple_pass.barcode = Barcode("1234", BarcodeFormat.QR)
+    pass_json = apple_pass.json_dict()
+    assert pass_json["barcode"] == pass_json["barcodes"][0]
+
+    apple_pass.barcode = Barcode("1234", BarcodeFormat.CODE128)
+    pass_json = apple_pass.json_dict()
+    assert pass_json["barcodes"][0]["format"] == BarcodeFormat.CODE128
+    assert pass_json["barcode"] == {
+        "format": BarcodeFormat.PDF417,
+        "message": "1234",
+        "messageEncoding": "iso-8859-1",
+    }
+
+
+def test_without_legacy_barcode(apple_pass):
+    apple_pass.barcode = Barcode("1234", BarcodeFormat.QR)
+    apple_pass.emit_legacy_barcode = False
+
+    pass_json = apple_pass.json_dict()
+
+    assert "barcode" not in pass_json
+    assert pass_json["barcodes"][0]["message"] == "1234"
+
+
+def test_unknown_attribute_is_rejected(apple_pass):
+    with pytest.raises(AttributeError):
+        apple_pass.serialNumber = "1234"
+
+
+def test_create(apple_pass, signing_files):
+    zip_file = apple_pass.create(*signing_files)
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert sorted(zf.namelist()) == [
+            "icon.png",
+            "manifest.json",
+            "pass.json",
+            "signature",
+        ]
+        manifest = json.loads(zf.read("manifest.json"))
+        assert manifest == {
+            "pass.json": hashlib.sha1(zf.read("pass.json")).hexdigest(),
+            "icon.png": hashlib.sha1(b"icon").hexdigest(),
+        }
+
+
+def test_manifest_hashes_every_file(apple_pass):
+    files = {
+        "icon.png": b"icon",
+        "logo.png": b"logo",
+        "strip.png": b"strip",
+        "thumbnail.png": b"thumbnail",
+    }
+    for filename, data in files.items():
+        apple_pass.add_file(filename, data)
+
+    manifest = json.loads(apple_pass._create_manifest(b"{}"))
+
+    assert list(manifest) == ["pass.json", *files]
+    assert manifest["strip.png"] == hashlib.sha1(b"strip").hexdigest()
+
+
+def test_manifest_rehashes_replaced_file(apple_pass):
+    apple_pass._create_manifest(b"{}")
+    apple_pass.add_file("icon.png", b"new icon")
+
+    manifest = json.loads(apple_pass._create_manifest(b"{}"))
+
+    assert manifest["icon.png"] == hashlib.sha1(b"new icon").hexdigest()
+
+
+def test_create_uses_fixed_timestamps(apple_pass, signing_files):
+    zip_file = apple_pass.create(*signing_files)
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert {info.date_time for info in zf.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+
+
+def test_create_to_path(apple_pass, signing_files, tmp_path):
+    pass_path = tmp_path / "mypass.pkpass"
+
+    apple_pass.create(*signing_files, zip_file=str(pass_path))
+
+    with zipfile.ZipFile(pass_path) as zf:
+        assert zf.testzip() is None
+        assert zf.read("icon.png") == b"icon"
+
+
+def test_create_to_path_writes_once(apple_pass, signing_files, tmp_path, monkeypatch):
+    writes = []
+
+    class File(BytesIO):
+        def write(self, data):
+            writes.append(len(data))
+            return super().write(data)
+
+    monkeypatch.setattr(models, "open", lambda *args: File(), raising=False)
+
+    apple_pass.create(*signing_files, zip_file=str(tmp_path / "mypass.pkpass"))
+
+    assert len(writes) == 1
+
+
+def test_create_to_unseekable_stream(apple_pass, signing_files):
+    class Stream(RawIOBase):
+        def __init__(self):
+            self.chunks = []
+
+        def writable(self):
+            return True
+
+        def write(self, data):
+            self.chunks.append(bytes(data))
+            return len(data)
+
+    stream = apple_pass.create(*signing_files, zip_file=Stream())
+
+    with zipfile.ZipFile(BytesIO(b"".join(stream.chunks))) as zf:
+        assert zf.testzip() is None
+
+
+def test_create_bytes(apple_pass, signing_files):
+    pkpass = apple_pass.create_bytes(*signing_files)
+
+    with zipfile.ZipFile(BytesIO(pkpass)) as zf:
+        assert "signature" in zf.namelist()
+
+
+def test_create_reuses_signing_material(apple_pass, signing_files):
+    models._load_signing_material.cache_clear()
+
+    apple_pass.create(*signing_files)
+    apple_pass.create(*signing_files)
+
+    cache_info = models._load_signing_material.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+
+
+def test_sign_manifest(signing_files):
+    signing_material = models.load_signing_material(*signing_files)
+
+    signature = models.sign_manifest(b"{}", signing_material)
+
+    certificates = pkcs7.load_der_pkcs7_certificates(signature)
+    assert signing_material[0] in certificates
+    assert signing_material[2] in certificates
+
+
+def test_create_with_bytes_password(apple_pass, signing_files):
+    certificate, key, wwdr_certificate, password = signing_files
+
+    zip_file = apple_pass.create(certificate, key, wwdr_certificate, password.encode())
+
+    assert zipfile.is_zipfile(zip_file)
+
+
+def test_create_reads_signing_files_once(apple_pass, signing_files, monkeypatch):
+    read_paths = []
+    read_file_bytes = models._read_file_bytes
+
+    def counting_read_file_bytes(path):
+        read_paths.append(path)
+        return read_file_bytes(path)
+
+    monkeypatch.setattr(models, "_read_file_bytes", counting_read_file_bytes)
+    models._load_signing_material.cache_clear()
+
+    apple_pass.create(*signing_files)
+    apple_pass.create(*signing_files)
+
+    assert len(read_paths) == 3
+
+
+def test_create_reloads_replaced_signing_material(apple_pass, signing_files):
+    certificate = signing_files[0]
+    models._load_signing_material.cache_clear()
+
+    apple_pass.create(*signing_files)
+    stat = os.stat(certificate)
+    os.utime(certificate, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    apple_pass.create(*signing_files)
+
+    assert models._load_signing_material.cache_info().misses == 2
+
+
+def test_create_deflates_everything_but_images(apple_pass, signing_files):
+    zip_file = apple_pass.create(*signing_files)
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert {info.filename: info.compress_type for info in zf.infolist()} == {
+            "signature": zipfile.ZIP_DEFLATED,
+            "manifest.json": zipfile.ZIP_DEFLATED,
+            "pass.json": zipfile.ZIP_DEFLATED,
+            "icon.png": zipfile.ZIP_STORED,
+        }
+
+
+def test_create_many(apple_pass, signing_files):
+    other_pass = ApplePass(EventTicket())
+    other_pass.serial_number = "5678"
+
+    zip_files = models.create_many(
+        [apple_pass, other_pass], *signing_files, max_workers=2
+    )
+
+    serial_numbers = []
+    for zip_file in zip_files:
+        with zipfile.ZipFile(zip_file) as zf:
+            assert "signature" in zf.namelist()
+            serial_numbers.append(json.loads(zf.read("pass.json"))["serialNumber"])
+    assert serial_numbers == ["1234", "5678"]
+
+
+def test_create_many_accepts_generator(apple_pass, signing_files):
+    zip_files = models.create_many(
+        (apple_pass for _ in range(2)), *signing_files, max_workers=1
+    )
+
+    assert len(zip_files) == 2